@@ -1,11 +1,21 @@
+import logging
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .port import Port
 
+log = logging.getLogger(__name__)
+
 class Connection:
     """Represents a connection between an output port and an input port."""
 
+    # No per-instance __dict__: connections are created and dropped in bulk.
+    # Hashing stays identity-based: _detach nulls the port references, so a
+    # hash derived from them would change while the connection is still a key
+    # in the graph's index. Duplicate edges can't arise anyway, since an input
+    # port accepts a single connection.
+    __slots__ = ('_output_port', '_input_port', '__weakref__')
+
     def __init__(self, output_port: 'Port', input_port: 'Port'):
         """
         Initializes a Connection. Assumes validation has already occurred.
@@ -28,6 +38,23 @@ class Connection:
         self._output_port.add_connection(self)
         self._input_port.add_connection(self)
 
+    @classmethod
+    def _from_validated(cls, output_port: 'Port', input_port: 'Port') -> 'Connection':
+        """
+        Creates a connection between ports already checked by Port.can_connect,
+        skipping the direction checks done by __init__.
+        """
+        connection = cls.__new__(cls)
+        connection._output_port = output_port
+        connection._input_port = input_port
+        output_port._connections.add(connection)
+        output_port._connected = True
+        output_port._rev += 1
+        input_port._connections.add(connection)
+        input_port._connected = True
+        input_port._rev += 1
+        return connection
+
     @property
     def output_port(self) -> 'Port':
         """Returns the output (source) port."""
@@ -42,25 +69,29 @@ class Connection:
 
     def remove(self) -> None:
         """Removes the connection from both connected ports."""
-        # --- Store repr before clearing references ---
-        connection_repr = repr(self)
-        # --- End change ---
-
-        if self._output_port:
-            self._output_port.remove_connection(self)
-        if self._input_port:
-            input_node = self._input_port.node # Get node before removing connection
-            self._input_port.remove_connection(self)
-            # No dirtiness marking in simplified version
-
-        # Clear references AFTER potentially using them (e.g., for repr)
+        if self._output_port is None:
+            return # Already removed
+
+        # Only build the repr (it walks port -> node) if it will be logged
+        connection_repr = repr(self) if log.isEnabledFor(logging.DEBUG) else None
+        self._detach()
+        if connection_repr is not None:
+            log.debug("Removed connection: %s", connection_repr)
+
+    def _detach(self) -> None:
+        """Drops this connection from both ports' sets and clears its port references."""
+        # No dirtiness marking in simplified version
+        output_port = self._output_port
+        output_port._connections.discard(self)
+        output_port._connected = bool(output_port._connections)
+        output_port._rev += 1
+        input_port = self._input_port
+        input_port._connections.discard(self)
+        input_port._connected = bool(input_port._connections)
+        input_port._rev += 1
         self._output_port = None
         self._input_port = None
 
-        # --- Print using the stored repr ---
-        print(f"Removed connection: {connection_repr}") # For debugging
-        # --- End change ---
-
     def __repr__(self) -> str:
         out_node_name = self.output_port.node.name if self.output_port and self.output_port.node else "<?>"
         in_node_name = self.input_port.node.name if self.input_port and self.input_port.node else "<?>"
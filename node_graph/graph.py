@@ -1,23 +1,56 @@
-from typing import Dict, List, Optional
+import logging
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import methodcaller
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 # Need Node, Port, Connection for basic structure management
 from .node import Node
-from .port import Port # For type hints in add_connection
+from .port import Port, PortType
 from .connection import Connection
 
+log = logging.getLogger(__name__)
+
 class Graph:
     """
     Manages a collection of Nodes and Connections.
-    *** SIMPLIFIED VERSION: Focuses on structure, removes evaluation,
-        topological sorting, cycle detection. ***
+    *** SIMPLIFIED VERSION: Focuses on structure, removes evaluation.
+        Cycles are not prevented; topo_order reports them. ***
     """
 
     def __init__(self):
-        self._nodes: Dict[str, Node] = {}
+        self._nodes: Dict[int, Node] = {}
         self._connections: List[Connection] = []
+        # Connection -> (position in _connections, output node ID, input node ID).
+        # The position allows O(1) swap-pop removal; the endpoint IDs are kept
+        # here because a connection detached via Connection.remove() no longer
+        # knows its nodes.
+        self._connection_index: Dict[Connection, Tuple[int, int, int]] = {}
+        # node_id -> connections touching that node, so node removal and
+        # traversal cost O(degree) rather than a scan of all connections
+        self._node_connections: Dict[int, Set[Connection]] = {}
+        # (node_id, port_name) -> Port, one index per direction so that an
+        # input and an output sharing a name don't collide.
+        self._output_port_index: Dict[Tuple[int, str], Port] = {}
+        self._input_port_index: Dict[Tuple[int, str], Port] = {}
+        # Bumped on every structural edit; derived data is stale once its
+        # recorded revision falls behind.
+        self._revision = 0
+        # Bumped only when nodes or ports are added or removed. Connection edits
+        # don't bump it: they are tracked per input port (Port._rev) instead.
+        self._port_revision = 0
+        # (output_node_id, output_port_name, input_node_id, input_port_name) ->
+        # (input port, its _rev when checked, valid)
+        self._validation_cache: Dict[Tuple[int, str, int, str],
+                                     Tuple[Optional[Port], int, bool]] = {}
+        self._validation_revision = 0
+        # Node IDs in dependency order, valid while _topo_revision == _revision
+        self._topo_cache: Optional[Tuple[int, ...]] = None
+        self._topo_revision = -1
 
     @property
-    def nodes(self) -> Dict[str, Node]:
+    def nodes(self) -> Dict[int, Node]:
         """Returns the dictionary of nodes in the graph."""
         return self._nodes # Or return a copy if mutation is a concern
 
@@ -26,8 +59,114 @@ class Graph:
          """Returns the list of connections in the graph."""
          return self._connections # Or return a copy
 
+    def has_connection(self, connection: Connection) -> bool:
+        """Whether this exact connection object is currently part of the graph (O(1))."""
+        return connection in self._connection_index
+
     def add_node(self, node: Node) -> None:
         """Adds a pre-constructed Node object to the graph."""
+        self._check_new_node(node)
+        self._nodes[node.id] = node
+        self._index_ports(node)
+        self._revision += 1
+        self._port_revision += 1
+        log.debug("Node '%s' (ID: %s) added to graph.", node.name, node.id)
+
+    def add_nodes(self, nodes: Iterable[Node]) -> None:
+        """
+        Adds many pre-constructed nodes at once (e.g. when loading a saved graph).
+        All nodes are validated before any is added, and the node dictionary is
+        grown in a single step instead of rehashing repeatedly.
+        """
+        new_nodes: Dict[int, Node] = {}
+        for node in nodes:
+            self._check_new_node(node)
+            if node.id in new_nodes:
+                raise ValueError(f"Node with ID '{node.id}' already exists in the graph.")
+            new_nodes[node.id] = node
+        self._nodes.update(new_nodes)
+        for node in new_nodes.values():
+            self._index_ports(node)
+        self._revision += 1
+        self._port_revision += 1
+        log.debug("Added %d nodes to graph.", len(new_nodes))
+
+    def topo_order(self) -> Tuple[int, ...]:
+        """
+        Returns all node IDs ordered so that every node comes after the nodes
+        feeding its inputs. The order is cached until the next graph edit.
+
+        Raises:
+            ValueError: If the connections form a cycle.
+        """
+        if self._topo_revision == self._revision:
+            return self._topo_cache
+        indegree: Dict[int, int] = dict.fromkeys(self._nodes, 0)
+        successors: Dict[int, List[int]] = {}
+        for connection in self._connections:
+            if connection._output_port is None:
+                continue # Detached via Connection.remove() but not yet unlisted
+            source_id = connection._output_port._node._id
+            target_id = connection._input_port._node._id
+            successors.setdefault(source_id, []).append(target_id)
+            indegree[target_id] += 1
+
+        # Kahn's algorithm; sources start in insertion order for a stable result
+        ready = deque(node_id for node_id, count in indegree.items() if count == 0)
+        order: List[int] = []
+        while ready:
+            node_id = ready.popleft()
+            order.append(node_id)
+            for target_id in successors.get(node_id, ()):
+                indegree[target_id] -= 1
+                if indegree[target_id] == 0:
+                    ready.append(target_id)
+        if len(order) != len(indegree):
+            raise ValueError("Graph contains a cycle; no topological order exists.")
+
+        self._topo_cache = tuple(order)
+        self._topo_revision = self._revision
+        return self._topo_cache
+
+    def process_all(self, max_workers: Optional[int] = None) -> None:
+        """
+        Calls process() on every node in dependency order. Nodes are grouped
+        into ranks by their longest path from a source node; nodes within a
+        rank don't depend on each other and run concurrently in a thread pool
+        (worthwhile when process() releases the GIL, e.g. in NumPy or I/O).
+
+        Args:
+            max_workers: Thread pool size; None uses the executor's default.
+
+        Raises:
+            ValueError: If the connections form a cycle.
+            Any exception raised by a node's process(), after its rank finishes.
+        """
+        order = self.topo_order()
+        rank: Dict[int, int] = dict.fromkeys(order, 0)
+        ranks: List[List[Node]] = []
+        for node_id in order:
+            node_rank = rank[node_id]
+            if node_rank == len(ranks):
+                ranks.append([])
+            ranks[node_rank].append(self._nodes[node_id])
+            for connection in self._node_connections.get(node_id, ()):
+                if connection._input_port is None:
+                    continue # Detached, see topo_order
+                target_id = connection._input_port._node._id
+                if target_id != node_id and rank[target_id] <= node_rank:
+                    rank[target_id] = node_rank + 1
+
+        process = methodcaller('process') # Dispatches to subclass overrides
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for nodes in ranks:
+                # Consuming the results waits for the rank and re-raises errors
+                for _ in executor.map(process, nodes):
+                    pass
+        log.debug("Processed %d nodes in %d ranks.", len(order), len(ranks))
+
+    def _check_new_node(self, node: Node) -> None:
+        """Raises if the node cannot be added to this graph."""
         if not isinstance(node, Node):
              raise TypeError("Object added must be an instance of Node.")
         if node.id in self._nodes:
@@ -36,31 +175,104 @@ class Graph:
         if hasattr(node, '_graph') and node.graph != self:
              raise ValueError("Node reports belonging to a different graph.")
 
-        self._nodes[node.id] = node
-        print(f"Node '{node.name}' (ID: {node.id}) added to graph.")
+    def _index_ports(self, node: Node) -> None:
+        """Adds all of a node's current ports to the port lookups."""
+        for port in node.output_ports.values():
+            self._output_port_index[(node.id, port.name)] = port
+        for port in node.input_ports.values():
+            self._input_port_index[(node.id, port.name)] = port
 
-    def remove_node(self, node_id: str) -> None:
+    def remove_node(self, node_id: int) -> None:
         """Removes a node and attempts to disconnect its connections."""
         node = self._nodes.get(node_id)
         if node:
-            # Disconnect all ports (Node.disconnect_all calls Connection.remove)
-            # Connection.remove should detach from ports.
-            # We need to clean up the graph's list via notify_connection_removed.
-            node.disconnect_all()
+            # Disconnect everything attached to the node via the adjacency index
+            self.remove_connections_bulk(self._node_connections.pop(node_id, ()))
 
-            # Remove node from graph dictionary
+            # Remove node and its ports from the graph's lookups
             del self._nodes[node_id]
-            print(f"Node '{node.name}' (ID: {node.id}) removed from graph.")
+            for port_name in node.output_ports:
+                self._output_port_index.pop((node_id, port_name), None)
+            for port_name in node.input_ports:
+                self._input_port_index.pop((node_id, port_name), None)
+            node.destroy()
+            self._revision += 1
+            self._port_revision += 1
+            log.debug("Node '%s' (ID: %s) removed from graph.", node.name, node.id)
         else:
-            print(f"Warning: Node with ID '{node_id}' not found for removal.")
+            log.warning("Node with ID '%s' not found for removal.", node_id)
 
 
-    def get_node(self, node_id: str) -> Optional[Node]:
+    def get_node(self, node_id: int) -> Optional[Node]:
         """Retrieves a node by its ID."""
         return self._nodes.get(node_id)
 
-    def add_connection(self, output_node_id: str, output_port_name: str,
-                       input_node_id: str, input_port_name: str) -> Optional[Connection]:
+    def _register_port(self, node: Node, port: Port) -> None:
+        """Indexes a port created on a node; ignored until the node is added."""
+        if self._nodes.get(node.id) is not node:
+            return
+        if port.port_type == PortType.OUTPUT:
+            self._output_port_index[(node.id, port.name)] = port
+        else:
+            self._input_port_index[(node.id, port.name)] = port
+        self._revision += 1
+        self._port_revision += 1
+
+    def can_add_connection(self, output_node_id: int, output_port_name: str,
+                           input_node_id: int, input_port_name: str) -> bool:
+        """
+        Checks whether add_connection with these arguments would succeed.
+        Results are cached, so repeated probes (e.g. while the user hovers
+        candidate ports) are O(1). Adding or removing nodes or ports drops the
+        whole cache; a connection edit only invalidates answers for the input
+        port it touched.
+        """
+        # Interned names match the (interned) index keys by identity
+        output_port_name = sys.intern(output_port_name)
+        input_port_name = sys.intern(input_port_name)
+        if self._validation_revision != self._port_revision:
+            self._validation_cache.clear()
+            self._validation_revision = self._port_revision
+        key = (output_node_id, output_port_name, input_node_id, input_port_name)
+        entry = self._validation_cache.get(key)
+        if entry is not None:
+            input_port, input_rev, valid = entry
+            # Only the input's connection state can change validity without a
+            # port-level edit (an input accepts a single connection)
+            if input_port is None or input_port._rev == input_rev:
+                return valid
+        valid = self._validate_connection(*key)
+        input_port = self._input_port_index.get((input_node_id, input_port_name))
+        self._validation_cache[key] = (input_port, input_port._rev if input_port else 0, valid)
+        return valid
+
+    def _validate_connection(self, output_node_id: int, output_port_name: str,
+                             input_node_id: int, input_port_name: str) -> bool:
+        """Uncached check behind can_add_connection; logs why a connection is refused."""
+        output_port = self._output_port_index.get((output_node_id, output_port_name))
+        input_port = self._input_port_index.get((input_node_id, input_port_name))
+
+        if output_port is None or input_port is None:
+            # Slow path, only taken to report which lookup failed
+            output_node = self.get_node(output_node_id)
+            input_node = self.get_node(input_node_id)
+            if not output_node:
+                log.warning("Connection Error: Output node '%s' not found.", output_node_id)
+            elif not input_node:
+                log.warning("Connection Error: Input node '%s' not found.", input_node_id)
+            elif not output_port:
+                log.warning("Connection Error: Output port '%s' not found on node '%s'.",
+                            output_port_name, output_node.name)
+            else:
+                log.warning("Connection Error: Input port '%s' not found on node '%s'.",
+                            input_port_name, input_node.name)
+            return False
+        # The indexes guarantee direction, so only node, type and input slot are checked
+        # (_can_connect_out_to_in logs the specific reason)
+        return output_port._can_connect_out_to_in(input_port)
+
+    def add_connection(self, output_node_id: int, output_port_name: str,
+                       input_node_id: int, input_port_name: str) -> Optional[Connection]:
         """
         Creates and adds a connection between two ports if valid (basic checks only).
         *** SIMPLIFIED: No cycle detection. ***
@@ -68,40 +280,76 @@ class Graph:
         Returns:
             The created Connection object, or None if connection failed basic checks.
         """
-        output_node = self.get_node(output_node_id)
-        input_node = self.get_node(input_node_id)
-
-        if not output_node:
-            print(f"Connection Error: Output node '{output_node_id}' not found.")
-            return None
-        if not input_node:
-            print(f"Connection Error: Input node '{input_node_id}' not found.")
+        output_port_name = sys.intern(output_port_name)
+        input_port_name = sys.intern(input_port_name)
+        if not self.can_add_connection(output_node_id, output_port_name,
+                                       input_node_id, input_port_name):
             return None
 
-        output_port = output_node.get_output_port(output_port_name)
-        input_port = input_node.get_input_port(input_port_name)
+        output_port = self._output_port_index[(output_node_id, output_port_name)]
+        input_port = self._input_port_index[(input_node_id, input_port_name)]
+        # Ports were validated above, so skip Connection.__init__'s re-checks
+        connection = Connection._from_validated(output_port, input_port)
+        self._register_connection(connection, output_node_id, input_node_id)
+        self._revision += 1
+        log.debug("Connection added: %s", connection)
+        return connection
 
-        if not output_port:
-            print(f"Connection Error: Output port '{output_port_name}' not found on node '{output_node.name}'.")
-            return None
-        if not input_port:
-            print(f"Connection Error: Input port '{input_port_name}' not found on node '{input_node.name}'.")
-            return None
-        # Use Port.can_connect for basic compatibility (types, direction, input slot)
-        if not output_port.can_connect(input_port):
-             # can_connect prints specific error messages
-             return None
-        
-        # --- Create Connection ---
+    def add_connections_batch(self, edges: Iterable[Tuple[int, str, int, str]]
+                              ) -> List[Optional[Connection]]:
+        """
+        Adds many connections at once (e.g. when loading a saved graph).
+
+        Args:
+            edges: (output_node_id, output_port_name, input_node_id, input_port_name)
+                   tuples, validated in order like add_connection.
+
+        Returns:
+            One entry per edge: the created Connection, or None if it was invalid.
+            If a malformed edge raises, the connections added before it remain.
+        """
+        output_index = self._output_port_index
+        input_index = self._input_port_index
+        register = self._register_connection
+        results: List[Optional[Connection]] = []
+        added = 0
         try:
-            # Assumes Connection constructor just stores ports and calls port.add_connection
-            connection = Connection(output_port, input_port)
-            self._connections.append(connection)
-            print(f"Connection added: {connection}")
-            return connection
-        except ValueError as e: # Catch potential errors during Connection init
-            print(f"Connection Error during creation: {e}")
-            return None
+            for output_node_id, output_port_name, input_node_id, input_port_name in edges:
+                output_port = output_index.get((output_node_id, sys.intern(output_port_name)))
+                input_port = input_index.get((input_node_id, sys.intern(input_port_name)))
+                if output_port is None or input_port is None:
+                    # Re-run the full check only to log which lookup failed
+                    self._validate_connection(output_node_id, output_port_name,
+                                              input_node_id, input_port_name)
+                    results.append(None)
+                    continue
+                # Earlier edges of the batch are already attached to their ports,
+                # so a second edge into the same input is refused here
+                if not output_port._can_connect_out_to_in(input_port):
+                    results.append(None)
+                    continue
+                # Each connection is fully registered as soon as it exists, so an
+                # error on a later edge leaves the earlier ones consistent
+                connection = Connection._from_validated(output_port, input_port)
+                register(connection, output_node_id, input_node_id)
+                results.append(connection)
+                added += 1
+        finally:
+            if added:
+                self._revision += 1
+        log.debug("Added %d of %d connections in batch.", added, len(results))
+        return results
+
+    def _register_connection(self, connection: Connection,
+                             output_node_id: int, input_node_id: int) -> None:
+        """
+        Lists a new connection and indexes it by its endpoint nodes (the
+        counterpart of _unlist_connection). Callers bump the revision.
+        """
+        self._connection_index[connection] = (len(self._connections), output_node_id, input_node_id)
+        self._connections.append(connection)
+        self._node_connections.setdefault(output_node_id, set()).add(connection)
+        self._node_connections.setdefault(input_node_id, set()).add(connection)
 
     # Inside node_graph/graph.py
 
@@ -110,29 +358,45 @@ class Graph:
         Removes a specific connection object from the graph's list AND
         ensures the connection is detached from its ports.
         """
-        # --- Call connection.remove() first ---
+        self._unlist_connection(connection_to_remove)
         if connection_to_remove:
              connection_to_remove.remove() # Ensure ports are notified
-        # --- End change ---
 
-        # Now remove from the graph's list
-        try:
-            self._connections.remove(connection_to_remove)
-            # The print statement from connection.remove() already happened
-            # print(f"Connection removed from graph list: {connection_to_remove}") # Optional: can remove this line now
-        except ValueError:
+    def remove_connections_bulk(self, connections: Iterable[Connection]) -> None:
+        """
+        Removes several connections in one pass, detaching each from its
+        ports. Connections already removed are skipped.
+        """
+        unlist = self._unlist_connection
+        for connection in connections:
+            unlist(connection)
+            connection.remove()
+
+    def _unlist_connection(self, connection: Connection) -> None:
+        """
+        Drops a connection from the graph's list (moving the last entry into its
+        slot) and from the per-node adjacency index.
+        """
+        entry = self._connection_index.pop(connection, None)
+        if entry is None:
             # Already removed, potentially by node.disconnect_all calling this method
-            pass # Avoid redundant warnings
+            return
+        self._revision += 1
+        index, output_node_id, input_node_id = entry
+        last = self._connections.pop()
+        if index < len(self._connections):
+            self._connections[index] = last
+            _, last_output_id, last_input_id = self._connection_index[last]
+            self._connection_index[last] = (index, last_output_id, last_input_id)
 
-    def notify_connection_removed(self, connection: Connection) -> None:
-        """Callback for Node/Connection to inform Graph the connection is gone."""
-        # This might now be redundant if remove_connection always calls conn.remove()
-        # Let's simplify: just call remove_connection directly
-        # This method might not even be needed anymore if node.disconnect calls graph.remove_connection
-        try:
-            self._connections.remove(connection)
-        except ValueError:
-            pass
+        # Uses the recorded node IDs, so this works even if the connection
+        # was already detached from its ports
+        for node_id in (output_node_id, input_node_id):
+            adjacent = self._node_connections.get(node_id)
+            if adjacent is not None:
+                adjacent.discard(connection)
+                if not adjacent:
+                    del self._node_connections[node_id]
 
     def notify_connection_removed(self, connection: Connection) -> None:
         """Callback for Node/Connection to inform Graph the connection is gone."""
@@ -1,5 +1,10 @@
+import itertools
+import logging
+import sys
+import threading
 import uuid
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List, Tuple
 
 # We keep Port/PortType for structure
 from .port import Port, PortType
@@ -10,16 +15,54 @@ if TYPE_CHECKING:
     from .graph import Graph
     from .connection import Connection # Needed for disconnect_all type hints
 
-import abc
-
-class Node(abc.ABC):
+log = logging.getLogger(__name__)
+
+# Shared read-only stand-in for the port dicts of nodes that have no ports of
+# that direction; add_input_port/add_output_port swap in a real dict.
+_NO_PORTS = MappingProxyType({})
+
+# Process-wide source of node IDs; ints hash and compare in a single step.
+# Explicit integer IDs (e.g. restored from a saved graph) move it past them,
+# so a later generated ID can't collide.
+_next_node_id = 1
+_node_id_lock = threading.Lock()
+
+def _claim_node_id(node_id: Optional[int]) -> int:
+    """Returns node_id, or a fresh ID if it is None, keeping generated IDs unique."""
+    global _next_node_id
+    with _node_id_lock:
+        if node_id is None:
+            node_id = _next_node_id
+            _next_node_id += 1
+        elif isinstance(node_id, int) and node_id >= _next_node_id:
+            _next_node_id = node_id + 1
+    return node_id
+
+class Node:
     """
-    Abstract base class for all nodes in the graph.
+    Base class for all nodes in the graph.
     *** SIMPLIFIED VERSION: Focuses on structure, removes evaluation,
         dirtiness, caching, and process execution logic. ***
+
+    Subclasses declare their fixed ports as (name, data_type) pairs in
+    INPUT_PORTS / OUTPUT_PORTS; _setup_ports remains available for ports
+    that depend on the instance.
+
+    input_ports / output_ports are read-only name -> Port mappings (a node
+    without ports in a direction shares an immutable empty one). Add ports
+    with add_input_port / add_output_port, never by writing to the mappings.
     """
 
-    def __init__(self, graph: 'Graph', name: str, node_id: Optional[str] = None):
+    INPUT_PORTS: Tuple[Tuple[str, type], ...] = ()
+    OUTPUT_PORTS: Tuple[Tuple[str, type], ...] = ()
+
+    # Subclasses that don't declare their own __slots__ still get a __dict__.
+    # __weakref__ keeps nodes weak-referenceable for external observers.
+    __slots__ = ('_graph', '_name', '_id', '_uuid', 'input_ports', 'output_ports', 'parameters',
+                 '__weakref__')
+
+    def __init__(self, graph: 'Graph', name: str, node_id: Optional[int] = None,
+                 node_uuid: Optional[str] = None):
         """
         Initializes a Node.
 
@@ -27,24 +70,41 @@ class Node(abc.ABC):
             graph: The Graph this node belongs to.
             name: A descriptive name for the node (e.g., "Blur", "Image Input").
             node_id: Optional specific ID. If None, a unique ID is generated.
+            node_uuid: Optional UUID string (e.g. from a saved graph). If None,
+                       one is generated on first access to uuid.
         """
         if graph is None:
             raise ValueError("Node must belong to a Graph.")
         self._graph = graph # Store graph reference
         self._name = name
-        self._id = node_id or str(uuid.uuid4()) # Ensure unique ID
-
-        self.input_ports: Dict[str, Port] = {}
-        self.output_ports: Dict[str, Port] = {}
+        self._id = _claim_node_id(node_id) # Ensure unique ID
+        self._uuid = node_uuid # Created on demand if not given, see uuid
+
+        # The node isn't in a graph yet, so add_*_port only builds the declared
+        # ports (registration is a no-op) while still rejecting duplicate names
+        cls = type(self)
+        self.input_ports: Mapping[str, Port] = _NO_PORTS
+        self.output_ports: Mapping[str, Port] = _NO_PORTS
+        for port_name, data_type in cls.INPUT_PORTS:
+            self.add_input_port(port_name, data_type)
+        for port_name, data_type in cls.OUTPUT_PORTS:
+            self.add_output_port(port_name, data_type)
         self.parameters: Dict[str, Any] = {} # Node-specific settings
 
         self._setup_ports()
         self._setup_parameters()
 
     @property
-    def id(self) -> str:
+    def id(self) -> int:
         return self._id
 
+    @property
+    def uuid(self) -> str:
+        """A globally unique string handle (e.g. for serialization), generated on first use."""
+        if self._uuid is None:
+            self._uuid = str(uuid.uuid4())
+        return self._uuid
+
     @property
     def name(self) -> str:
         return self._name
@@ -58,10 +118,8 @@ class Node(abc.ABC):
     def graph(self) -> 'Graph':
         return self._graph
 
-    # Subclasses still need to define their ports
-    @abc.abstractmethod
     def _setup_ports(self) -> None:
-        """Abstract method for subclasses to define their input/output ports."""
+        """Optional method for subclasses to add ports beyond INPUT_PORTS/OUTPUT_PORTS."""
         pass
 
     def _setup_parameters(self) -> None:
@@ -72,18 +130,26 @@ class Node(abc.ABC):
 
     def add_input_port(self, name: str, data_type: type = Any) -> Port:
         """Creates and adds an input port."""
+        name = sys.intern(name) # Port names are a small shared vocabulary
         if name in self.input_ports:
             raise ValueError(f"Input port '{name}' already exists on node '{self.name}'.")
         port = Port(self, name, PortType.INPUT, data_type)
+        if self.input_ports is _NO_PORTS:
+            self.input_ports = {}
         self.input_ports[name] = port
+        self._graph._register_port(self, port)
         return port
 
     def add_output_port(self, name: str, data_type: type = Any) -> Port:
         """Creates and adds an output port."""
+        name = sys.intern(name)
         if name in self.output_ports:
             raise ValueError(f"Output port '{name}' already exists on node '{self.name}'.")
         port = Port(self, name, PortType.OUTPUT, data_type)
+        if self.output_ports is _NO_PORTS:
+            self.output_ports = {}
         self.output_ports[name] = port
+        self._graph._register_port(self, port)
         return port
 
     def get_input_port(self, name: str) -> Optional[Port]:
@@ -94,13 +160,14 @@ class Node(abc.ABC):
 
     def set_parameter(self, name: str, value: Any) -> None:
         """Sets a node parameter."""
+        name = sys.intern(name)
         if name in self.parameters:
             if self.parameters[name] != value:
                 self.parameters[name] = value
                 # Removed self.mark_dirty()
-                print(f"Parameter '{name}' set to '{value}' on node '{self.name}'.")
+                log.debug("Parameter '%s' set to '%s' on node '%s'.", name, value, self.name)
         else:
-            print(f"Warning: Setting unknown parameter '{name}' on node '{self.name}'.")
+            log.warning("Setting unknown parameter '%s' on node '%s'.", name, self.name)
             self.parameters[name] = value
             # Removed self.mark_dirty()
 
@@ -111,7 +178,8 @@ class Node(abc.ABC):
     def process(self) -> None:
         """
         Method where the node's computation logic would reside.
-        *** In this simplified framework, this method is NOT automatically called. ***
+        *** In this simplified framework, it only runs when Graph.process_all is called;
+            nodes in the same rank may run concurrently on worker threads. ***
         """
         pass # Subclasses will override
 
@@ -119,17 +187,29 @@ class Node(abc.ABC):
 
     def disconnect_all(self):
         """Removes all connections attached to this node's ports."""
-        print(f"Disconnecting all ports for node {self.name} ({self.id})")
-        ports_to_clear = list(self.input_ports.values()) + list(self.output_ports.values())
-        for port in ports_to_clear:
-            for conn in list(port.connections):
-                 # Let the graph handle the full removal process
-                 if self.graph:
-                     self.graph.remove_connection(conn)
-                 else:
-                      # Fallback if no graph context? Should ideally not happen.
-                      conn.remove()
+        log.debug("Disconnecting all ports for node %s (%s)", self.name, self.id)
+        # Gather every attached connection first (removal mutates the port
+        # sets), then hand them to the graph in a single call.
+        to_remove = set()
+        for port in itertools.chain(self.input_ports.values(), self.output_ports.values()):
+            to_remove.update(port._connections)
+        if self.graph:
+            self.graph.remove_connections_bulk(to_remove)
+        else:
+            # Fallback if no graph context? Should ideally not happen.
+            for conn in to_remove:
+                conn.remove()
 
+    def destroy(self) -> None:
+        """
+        Detaches this node's ports from it and drops them, breaking the
+        Node <-> Port cycle. Called by Graph.remove_node once the node is
+        disconnected; the node has no ports afterwards.
+        """
+        for port in itertools.chain(self.input_ports.values(), self.output_ports.values()):
+            port._node = None
+        self.input_ports = _NO_PORTS
+        self.output_ports = _NO_PORTS
 
     def __repr__(self) -> str:
         return f"<Node {self.name} (ID: {self.id})>"
\ No newline at end of file
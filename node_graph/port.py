@@ -1,12 +1,15 @@
 import enum
-import weakref # Use weakref to avoid circular references Node <-> Port
-from typing import TYPE_CHECKING, Any, Type, List, Optional
+import logging
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Type, Optional, Set, Tuple
 
 # Forward reference for type hinting
 if TYPE_CHECKING:
     from .node import Node
     from .connection import Connection
 
+log = logging.getLogger(__name__)
+
 class PortType(enum.Enum):
     """Enum defining whether a port is for input or output."""
     INPUT = 1
@@ -15,28 +18,48 @@ class PortType(enum.Enum):
 class Port:
     """Represents an input or output connection point on a Node."""
 
+    __slots__ = ('_node', '_name', '_port_type', '_data_type', '_type_id', '_connections',
+                 '_connected', '_rev', '_data', '_repr_suffix', '__weakref__')
+
+    # Every data type seen by a port gets a small integer ID (Any is 0), so the
+    # compatibility check is a bit test instead of an issubclass MRO walk.
+    # Row i of the masks below describes output type i: bit k of
+    # _COMPAT_KNOWN[i] is set once type k has been checked, and the same bit of
+    # _COMPAT_BITS[i] holds the answer. Shared by all ports.
+    _TYPE_IDS: Dict[Type, int] = {Any: 0}
+    _TYPES: List[Type] = [Any]
+    _COMPAT_KNOWN: List[int] = [0]
+    _COMPAT_BITS: List[int] = [0]
+
     def __init__(self, node: 'Node', name: str, port_type: PortType, data_type: Type = Any):
         """
         Initializes a Port.
 
         Args:
-            node: The Node this port belongs to (using weakref).
+            node: The Node this port belongs to.
             name: The unique name of the port within the node.
             port_type: PortType.INPUT or PortType.OUTPUT.
             data_type: The expected Python type of data for this port (e.g., int, float, np.ndarray).
                        Used for connection validation. Defaults to Any.
         """
-        self._node_ref = weakref.ref(node) # Avoid circular reference
-        self._name = name
+        # Strong reference; the Node <-> Port cycle is broken explicitly when
+        # the graph removes the node (see Node.destroy)
+        self._node: Optional['Node'] = node
+        self._name = sys.intern(name)
         self._port_type = port_type
         self._data_type = data_type
-        self._connections: List['Connection'] = []
+        self._type_id = Port._register_type(data_type)
+        self._connections: Set['Connection'] = set()
+        self._connected = False # Mirrors bool(_connections) for the hot checks
+        self._rev = 0 # Bumped whenever _connections changes
         self._data: Any = None # Cached data for outputs or received data for inputs
+        # Name and types never change after creation; only the node name can
+        self._repr_suffix = f".{name} ({port_type.name}, {data_type.__name__})>"
 
     @property
     def node(self) -> Optional['Node']:
-        """Returns the node this port belongs to, or None if the node has been deleted."""
-        return self._node_ref()
+        """Returns the node this port belongs to, or None if the node has been removed."""
+        return self._node
 
     @property
     def name(self) -> str:
@@ -54,10 +77,10 @@ class Port:
         return self._data_type
 
     @property
-    def connections(self) -> List['Connection']:
-        """Returns a list of connections attached to this port."""
-        # Return a copy to prevent external modification
-        return list(self._connections)
+    def connections(self) -> Tuple['Connection', ...]:
+        """Returns the connections attached to this port."""
+        # Immutable snapshot; callers may iterate it while connections are removed
+        return tuple(self._connections)
 
     def get_data(self) -> Any:
         """
@@ -68,7 +91,7 @@ class Port:
         node = self.node
         if not node:
             # Should ideally not happen if graph management is correct
-            print(f"Warning: Accessing port '{self.name}' on a deleted node.")
+            log.warning("Accessing port '%s' on a deleted node.", self.name)
             return None
 
         if self.port_type == PortType.INPUT:
@@ -76,11 +99,11 @@ class Port:
             if not self.is_connected():
                 # Return default value or raise error? For now, None.
                 # Specific nodes might handle unconnected inputs differently.
-                # print(f"Warning: Input port '{self.node.name}.{self.name}' is not connected.")
+                # log.warning("Input port '%s.%s' is not connected.", node.name, self.name)
                 return None
             else:
                 # Assumes only one connection per input port (common practice)
-                connection = self._connections[0]
+                connection = next(iter(self._connections))
                 output_port = connection.output_port
                 # Trigger evaluation of the upstream node if needed
                 output_node = output_port.node
@@ -89,7 +112,7 @@ class Port:
                    # More refined: evaluate should return all output port data
                    # return output_node.evaluate().get(output_port.name) # Ideal, needs evaluate() update
                 else:
-                     print(f"Warning: Upstream node for port '{self.node.name}.{self.name}' not found.")
+                     log.warning("Upstream node for port '%s.%s' not found.", node.name, self.name)
                      return None
 
 
@@ -98,7 +121,8 @@ class Port:
             # The evaluation logic is handled by the Node.evaluate() method
              if node.is_dirty():
                 # This should ideally be caught by Node.evaluate calling this
-                print(f"Warning: Accessing data from dirty output port '{node.name}.{self.name}' without evaluation.")
+                log.warning("Accessing data from dirty output port '%s.%s' without evaluation.",
+                            node.name, self.name)
                 # Trigger evaluation just in case, though Node.evaluate should be the entry point
                 node.evaluate()
              return node.get_cached_output(self.name) # Get specific port data
@@ -130,55 +154,89 @@ class Port:
         Returns:
             True if connection is valid, False otherwise.
         """
-        if not other_port:
-            return False
-        # Cannot connect to self
-        if self == other_port:
-            return False
-        # Cannot connect to a port on the same node
-        if self.node == other_port.node:
+        # Cheapest checks first; nothing is formatted unless a check fails and
+        # DEBUG logging is enabled.
+        if other_port is None or other_port is self:
             return False
         # Must connect Input to Output or vice-versa
-        if self.port_type == other_port.port_type:
+        if self._port_type is other_port._port_type:
             return False
+        if self._port_type is PortType.INPUT:
+            return other_port._can_connect_out_to_in(self)
+        return self._can_connect_out_to_in(other_port)
 
-        # Ensure data types are compatible (simple check for now, Any allows anything)
-        # More complex type compatibility (e.g., inheritance) could be added here.
-        input_port = self if self.port_type == PortType.INPUT else other_port
-        output_port = other_port if self.port_type == PortType.INPUT else self
+    def _can_connect_out_to_in(self, input_port: 'Port') -> bool:
+        """
+        can_connect for callers that already know self is an OUTPUT port and
+        input_port is an INPUT port (e.g. Graph.add_connection).
+        """
+        # Cannot connect to a port on the same node
+        if self._node is input_port._node:
+            return False
 
-        if input_port.data_type != Any and output_port.data_type != Any:
-             # Basic check: allow connection if types match exactly or if one is Any
-             # A more robust system might check for assignability/subclassing
-             if input_port.data_type != output_port.data_type:
-                  print(f"Connection failed: Data type mismatch between {output_port.node.name}.{output_port.name} ({output_port.data_type.__name__}) and {input_port.node.name}.{input_port.name} ({input_port.data_type.__name__})")
-                  return False
+        # Ensure data types are compatible (Any allows anything, subclasses may feed bases)
+        if not Port._types_compatible(self._type_id, input_port._type_id):
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Connection failed: Data type mismatch between %r and %r",
+                          self, input_port)
+            return False
 
         # Input ports typically only allow one connection
-        if input_port.is_connected():
-             print(f"Connection failed: Input port '{input_port.node.name}.{input_port.name}' is already connected.")
-             return False
+        if input_port._connected:
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Connection failed: Input port %r is already connected.", input_port)
+            return False
 
         return True
 
-    def add_connection(self, connection: 'Connection') -> None:
-        """Adds a connection to this port's list."""
-        if connection not in self._connections:
-            self._connections.append(connection)
+    @staticmethod
+    def _register_type(data_type: Type) -> int:
+        """Returns the integer ID of a data type, assigning the next free one if new."""
+        type_id = Port._TYPE_IDS.get(data_type)
+        if type_id is None:
+            type_id = len(Port._TYPES)
+            Port._TYPE_IDS[data_type] = type_id
+            Port._TYPES.append(data_type)
+            Port._COMPAT_KNOWN.append(0)
+            Port._COMPAT_BITS.append(0)
+        return type_id
+
+    @staticmethod
+    def _types_compatible(out_type_id: int, in_type_id: int) -> bool:
+        """Whether data of the output type may feed an input of the input type (memoized)."""
+        bit = 1 << in_type_id
+        if not Port._COMPAT_KNOWN[out_type_id] & bit:
+            out_type = Port._TYPES[out_type_id]
+            in_type = Port._TYPES[in_type_id]
+            # Any on either side allows anything; subclasses may feed bases
+            if out_type_id == 0 or in_type_id == 0 or out_type == in_type:
+                compatible = True
+            else:
+                try:
+                    compatible = issubclass(out_type, in_type)
+                except TypeError: # Not a class, e.g. a typing construct
+                    compatible = False
+            Port._COMPAT_KNOWN[out_type_id] |= bit
+            if compatible:
+                Port._COMPAT_BITS[out_type_id] |= bit
+        return bool(Port._COMPAT_BITS[out_type_id] & bit)
 
+    def add_connection(self, connection: 'Connection') -> None:
+        """Adds a connection to this port's set."""
+        self._connections.add(connection)
+        self._connected = True
+        self._rev += 1
 
     def remove_connection(self, connection: 'Connection') -> None:
-        """Removes a connection from this port's list."""
-        try:
-            self._connections.remove(connection)
-        except ValueError:
-            # Connection not found, potentially already removed
-            pass
+        """Removes a connection from this port's set (no-op if already removed)."""
+        self._connections.discard(connection)
+        self._connected = bool(self._connections)
+        self._rev += 1
 
     def is_connected(self) -> bool:
         """Checks if the port has one or more connections."""
-        return len(self._connections) > 0
+        return self._connected
 
     def __repr__(self) -> str:
-        node_name = self.node.name if self.node else "Detached"
-        return f"<Port {node_name}.{self.name} ({self.port_type.name}, {self.data_type.__name__})>"
\ No newline at end of file
+        node = self._node
+        return f"<Port {node.name if node else 'Detached'}{self._repr_suffix}"
\ No newline at end of file
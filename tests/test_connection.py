@@ -3,26 +3,21 @@ from node_graph import Port, PortType, Node, Graph, Connection
 
 # Minimal Node and Graph for context
 class MockNodeForConn(Node):
-    def __init__(self, graph, name):
-        self._graph = graph
-        self._name = name
-        self._id = f"mock_{name}"
-        self.input_ports = {}
-        self.output_ports = {}
-        self.parameters = {}
-
-    def _setup_ports(self): pass
-    # def process(self): pass
+    pass
 
 class MockGraphForConn:
      def notify_connection_removed(self, conn): pass # Dummy method
 
 class TestConnection(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        # Nodes are only used as port owners and never modified by the tests
+        cls.mock_graph = MockGraphForConn()
+        cls.node1 = MockNodeForConn(cls.mock_graph, "NodeA")
+        cls.node2 = MockNodeForConn(cls.mock_graph, "NodeB")
+
     def setUp(self):
-        self.mock_graph = MockGraphForConn()
-        self.node1 = MockNodeForConn(self.mock_graph, "NodeA")
-        self.node2 = MockNodeForConn(self.mock_graph, "NodeB")
         self.out_port = Port(self.node1, "out", PortType.OUTPUT)
         self.in_port = Port(self.node2, "in", PortType.INPUT)
 
@@ -66,6 +61,11 @@ class TestConnection(unittest.TestCase):
         self.assertIsNone(connection._output_port)
         self.assertIsNone(connection._input_port)
 
+    def test_connection_has_no_instance_dict(self):
+        """Test Connection keeps its state in slots (no per-instance __dict__)."""
+        connection = Connection(self.out_port, self.in_port)
+        self.assertFalse(hasattr(connection, "__dict__"))
+
     def test_connection_repr(self):
         """Test the string representation of the connection."""
         connection = Connection(self.out_port, self.in_port)
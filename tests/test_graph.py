@@ -42,6 +42,19 @@ class TestGraph(unittest.TestCase):
         self.assertIn(self.node_proc.id, self.graph.nodes)
         self.assertIs(self.graph.get_node(self.node_in.id), self.node_in)
 
+    def test_add_nodes(self):
+        """Test adding several nodes in one call."""
+        self.graph.add_nodes([self.node_in, self.node_proc, self.node_out])
+        self.assertEqual(len(self.graph.nodes), 3)
+        conn = self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        self.assertIsNotNone(conn)
+
+    def test_add_nodes_duplicate_adds_nothing(self):
+        """Test a batch with a duplicate ID is rejected as a whole."""
+        with self.assertRaisesRegex(ValueError, "already exists"):
+            self.graph.add_nodes([self.node_in, self.node_proc, self.node_in])
+        self.assertEqual(len(self.graph.nodes), 0)
+
     def test_add_duplicate_node_id_raises_error(self):
         """Test adding a node with an existing ID fails."""
         self.graph.add_node(self.node_in)
@@ -68,6 +81,7 @@ class TestGraph(unittest.TestCase):
         self.assertIsInstance(conn, Connection)
         self.assertEqual(len(self.graph.connections), 1)
         self.assertIn(conn, self.graph.connections)
+        self.assertTrue(self.graph.has_connection(conn))
         self.assertTrue(self.node_in.get_output_port("out").is_connected())
         self.assertTrue(self.node_proc.get_input_port("in1").is_connected())
         self.assertIn(conn, self.node_in.get_output_port("out").connections)
@@ -91,6 +105,63 @@ class TestGraph(unittest.TestCase):
         self.assertIsNone(conn)
         self.assertEqual(len(self.graph.connections), 0)
 
+    def test_add_connection_to_port_added_after_node(self):
+        """Test ports created after the node joins the graph can be connected."""
+        self.graph.add_node(self.node_in)
+        self.graph.add_node(self.node_out)
+        self.node_out.add_input_port("late_in", data_type=int)
+        conn = self.graph.add_connection(self.node_in.id, "out", self.node_out.id, "late_in")
+        self.assertIsNotNone(conn)
+        self.assertTrue(self.node_out.get_input_port("late_in").is_connected())
+
+    def test_add_first_port_of_a_direction(self):
+        """Test adding an input to a node without inputs leaves other nodes untouched."""
+        other_input = InputNode(self.graph, "Input2")
+        self.node_in.add_input_port("trigger")
+        self.assertIn("trigger", self.node_in.input_ports)
+        self.assertEqual(len(other_input.input_ports), 0)
+
+    def test_add_connections_batch(self):
+        """Test batch creation reports one result per edge, in order."""
+        self.graph.add_nodes([self.node_in, self.node_proc, self.node_out])
+        node_in2 = InputNode(self.graph, "Input2")
+        self.graph.add_node(node_in2)
+        results = self.graph.add_connections_batch([
+            (self.node_in.id, "out", self.node_proc.id, "in1"),
+            (node_in2.id, "out", self.node_proc.id, "in1"), # Input already taken in this batch
+            (self.node_in.id, "out", self.node_proc.id, "in2"), # Type mismatch
+            (self.node_proc.id, "res", self.node_out.id, "final_in"),
+            (self.node_in.id, "bad_port", self.node_out.id, "final_in"),
+        ])
+        self.assertEqual(len(results), 5)
+        self.assertIsInstance(results[0], Connection)
+        self.assertIsNone(results[1])
+        self.assertIsNone(results[2])
+        self.assertIsInstance(results[3], Connection)
+        self.assertIsNone(results[4])
+        self.assertEqual(self.graph.connections, [results[0], results[3]])
+
+        # Batch-created connections are fully indexed
+        self.graph.remove_node(self.node_proc.id)
+        self.assertEqual(len(self.graph.connections), 0)
+        self.assertFalse(self.node_in.get_output_port("out").is_connected())
+
+    def test_add_connections_batch_malformed_edge(self):
+        """Test edges added before a malformed one stay fully registered."""
+        self.graph.add_nodes([self.node_in, self.node_proc, self.node_out])
+        with self.assertRaises(ValueError):
+            self.graph.add_connections_batch([
+                (self.node_in.id, "out", self.node_proc.id, "in1"),
+                (self.node_proc.id, "res", self.node_out.id), # Too short
+            ])
+        conn = self.node_proc.get_input_port("in1").connections[0]
+        self.assertEqual(self.graph.connections, [conn])
+        self.assertTrue(self.graph.has_connection(conn))
+        self.graph.remove_connection(conn)
+        self.assertFalse(self.node_proc.get_input_port("in1").is_connected())
+        self.assertIsNotNone(
+            self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1"))
+
     def test_add_connection_invalid_type_mismatch(self):
         """Test adding connection fails on incompatible data types."""
         self.graph.add_node(self.node_in)
@@ -114,6 +185,28 @@ class TestGraph(unittest.TestCase):
         self.assertIsNone(conn2)
         self.assertEqual(len(self.graph.connections), 1) # Only first connection exists
 
+    def test_can_add_connection_tracks_edits(self):
+        """Test cached validation answers are refreshed after graph edits."""
+        self.graph.add_node(self.node_in)
+        self.graph.add_node(self.node_proc)
+        node_in2 = InputNode(self.graph, "Input2")
+        self.graph.add_node(node_in2)
+        self.assertTrue(self.graph.can_add_connection(node_in2.id, "out", self.node_proc.id, "in1"))
+        self.assertFalse(self.graph.can_add_connection(node_in2.id, "out", self.node_proc.id, "in2"))
+
+        conn = self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        self.assertFalse(self.graph.can_add_connection(node_in2.id, "out", self.node_proc.id, "in1"))
+        self.graph.remove_connection(conn)
+        self.assertTrue(self.graph.can_add_connection(node_in2.id, "out", self.node_proc.id, "in1"))
+
+    def test_can_add_connection_after_node_removed(self):
+        """Test cached validation answers are dropped when a node goes away."""
+        self.graph.add_node(self.node_in)
+        self.graph.add_node(self.node_proc)
+        self.assertTrue(self.graph.can_add_connection(self.node_in.id, "out", self.node_proc.id, "in1"))
+        self.graph.remove_node(self.node_proc.id)
+        self.assertFalse(self.graph.can_add_connection(self.node_in.id, "out", self.node_proc.id, "in1"))
+
     def test_remove_connection(self):
         """Test removing a connection explicitly from the graph."""
         self.graph.add_node(self.node_in)
@@ -128,9 +221,37 @@ class TestGraph(unittest.TestCase):
         self.graph.remove_connection(conn) # Should call conn.remove() internally
 
         self.assertEqual(len(self.graph.connections), 0)
+        self.assertFalse(self.graph.has_connection(conn))
         self.assertFalse(out_port.is_connected())
         self.assertFalse(in_port.is_connected())
 
+    def test_remove_connection_keeps_others(self):
+        """Test removing one connection leaves the remaining ones listed."""
+        self.graph.add_node(self.node_in)
+        self.graph.add_node(self.node_proc)
+        self.graph.add_node(self.node_out)
+        conn1 = self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        conn2 = self.graph.add_connection(self.node_proc.id, "res", self.node_out.id, "final_in")
+
+        self.graph.remove_connection(conn1)
+        self.assertEqual(self.graph.connections, [conn2])
+        self.graph.remove_connection(conn1) # Removing twice is a no-op
+        self.assertEqual(self.graph.connections, [conn2])
+
+    def test_remove_connection_after_connection_removed(self):
+        """Test a connection detached via Connection.remove() still unlists cleanly."""
+        self.graph.add_nodes([self.node_in, self.node_proc])
+        conn = self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+
+        conn.remove()
+        self.graph.remove_connection(conn)
+
+        self.assertEqual(len(self.graph.connections), 0)
+        self.assertFalse(self.graph.has_connection(conn))
+        self.graph.process_all() # No stale adjacency entries left behind
+        self.graph.remove_node(self.node_proc.id)
+        self.assertEqual(len(self.graph.connections), 0)
+
     def test_remove_node_removes_connections(self):
         """Test that removing a node also removes its connections from the graph."""
         self.graph.add_node(self.node_in)
@@ -143,6 +264,8 @@ class TestGraph(unittest.TestCase):
         self.assertTrue(self.node_proc.get_input_port("in1").is_connected())
         self.assertTrue(self.node_proc.get_output_port("res").is_connected())
         self.assertTrue(self.node_out.get_input_port("final_in").is_connected())
+        proc_in = self.node_proc.get_input_port("in1")
+        proc_out = self.node_proc.get_output_port("res")
 
         # Remove the middle node
         self.graph.remove_node(self.node_proc.id)
@@ -154,6 +277,56 @@ class TestGraph(unittest.TestCase):
         # Check ports on remaining nodes are disconnected
         self.assertFalse(self.node_in.get_output_port("out").is_connected())
         self.assertFalse(self.node_out.get_input_port("final_in").is_connected())
+        # Removed node is destroyed: its ports are detached and dropped
+        self.assertIsNone(proc_in.node)
+        self.assertIsNone(proc_out.node)
+        self.assertEqual(len(self.node_proc.input_ports), 0)
+        self.assertEqual(len(self.node_proc.output_ports), 0)
+
+    def test_topo_order(self):
+        """Test nodes are ordered after their inputs and the order follows edits."""
+        self.graph.add_nodes([self.node_out, self.node_proc, self.node_in])
+        self.graph.add_connection(self.node_proc.id, "res", self.node_out.id, "final_in")
+        self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        self.assertEqual(self.graph.topo_order(),
+                         (self.node_in.id, self.node_proc.id, self.node_out.id))
+        self.assertIs(self.graph.topo_order(), self.graph.topo_order()) # Cached
+
+        self.graph.remove_node(self.node_proc.id)
+        self.assertEqual(self.graph.topo_order(), (self.node_out.id, self.node_in.id))
+
+    def test_topo_order_skips_detached_connections(self):
+        """Test a connection removed from its ports but still listed adds no edge."""
+        self.graph.add_nodes([self.node_proc, self.node_in])
+        conn = self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        conn.remove()
+        self.assertEqual(self.graph.topo_order(), (self.node_proc.id, self.node_in.id))
+        self.graph.process_all()
+
+    def test_topo_order_cycle_raises_error(self):
+        """Test a cycle is reported instead of producing a partial order."""
+        self.graph.add_nodes([self.node_in, self.node_proc])
+        self.node_in.add_input_port("loop_in", data_type=int)
+        self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        self.graph.add_connection(self.node_proc.id, "res", self.node_in.id, "loop_in")
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            self.graph.topo_order()
+
+    def test_process_all_runs_nodes_after_their_inputs(self):
+        """Test process_all calls every node once, upstream nodes first."""
+        node_in2 = InputNode(self.graph, "Input2")
+        self.graph.add_nodes([self.node_out, self.node_proc, self.node_in, node_in2])
+        self.graph.add_connection(self.node_in.id, "out", self.node_proc.id, "in1")
+        self.graph.add_connection(self.node_proc.id, "res", self.node_out.id, "final_in")
+        processed = []
+        for node in self.graph.nodes.values():
+            node.process = lambda node=node: processed.append(node)
+
+        self.graph.process_all(max_workers=2)
+
+        self.assertEqual(len(processed), 4)
+        self.assertEqual(set(processed[:2]), {self.node_in, node_in2})
+        self.assertEqual(processed[2:], [self.node_proc, self.node_out])
 
     def test_node_disconnect_all_removes_connections_from_graph(self):
         """Verify node.disconnect_all notifies the graph to remove connections."""
@@ -22,6 +22,11 @@ class AdderNode(Node):
         # self.set_output_data("result", result) # Would need set_output_data
         pass
 
+# A node that declares its ports statically instead of in _setup_ports
+class ScaleNode(Node):
+    INPUT_PORTS = (("value", float),)
+    OUTPUT_PORTS = (("scaled", float),)
+
 class TestNode(unittest.TestCase):
 
     def setUp(self):
@@ -42,6 +47,26 @@ class TestNode(unittest.TestCase):
         self.assertIn("bias", self.node.parameters)
         self.assertEqual(self.node.get_parameter("bias"), 0.0)
 
+    def test_node_ids_unique(self):
+        """Test generated IDs are distinct ints and the UUID handle is stable."""
+        other = AdderNode(self.graph, "OtherAdder")
+        self.assertIsInstance(self.node.id, int)
+        self.assertNotEqual(self.node.id, other.id)
+        self.assertEqual(self.node.uuid, self.node.uuid)
+        self.assertNotEqual(self.node.uuid, other.uuid)
+
+    def test_explicit_node_id_not_reused(self):
+        """Test generated IDs skip past explicitly supplied integer IDs."""
+        explicit = AdderNode(self.graph, "Restored", node_id=self.node.id + 1000)
+        generated = AdderNode(self.graph, "Fresh")
+        self.assertGreater(generated.id, explicit.id)
+        self.graph.add_nodes([explicit, generated])
+
+    def test_node_uuid_supplied(self):
+        """Test a UUID given at construction is kept as the node's handle."""
+        node = AdderNode(self.graph, "Restored", node_uuid="1234-abcd")
+        self.assertEqual(node.uuid, "1234-abcd")
+
     def test_add_ports(self):
         """Test adding ports via helper methods."""
         in_port = self.node.get_input_port("in_a")
@@ -51,11 +76,30 @@ class TestNode(unittest.TestCase):
         self.assertEqual(in_port.name, "in_a")
         self.assertEqual(in_port.port_type, PortType.INPUT)
         self.assertEqual(in_port.data_type, float)
-        self.assertIs(in_port.node, self.node) # Check weakref resolves correctly
+        self.assertIs(in_port.node, self.node) # Check back-reference to the owning node
         self.assertEqual(out_port.name, "result")
         self.assertEqual(out_port.port_type, PortType.OUTPUT)
         self.assertEqual(out_port.data_type, float)
 
+    def test_declared_ports(self):
+        """Test ports declared via INPUT_PORTS/OUTPUT_PORTS are created and indexed."""
+        node = ScaleNode(self.graph, "Scale")
+        self.graph.add_node(node)
+        in_port = node.get_input_port("value")
+        self.assertEqual(in_port.port_type, PortType.INPUT)
+        self.assertEqual(in_port.data_type, float)
+        self.assertIs(in_port.node, node)
+        self.assertEqual(list(node.output_ports), ["scaled"])
+        conn = self.graph.add_connection(node.id, "scaled", self.node.id, "in_a")
+        self.assertIsNotNone(conn)
+
+    def test_declared_duplicate_port_raises_error(self):
+        """Test a port name declared twice is rejected like add_input_port does."""
+        class TwiceNode(Node):
+            INPUT_PORTS = (("x", int), ("x", float))
+        with self.assertRaisesRegex(ValueError, "Input port 'x' already exists"):
+            TwiceNode(self.graph, "Twice")
+
     def test_add_duplicate_port_raises_error(self):
         """Test that adding a port with an existing name fails."""
         with self.assertRaisesRegex(ValueError, "Input port 'in_a' already exists"):
@@ -4,21 +4,9 @@ from typing import Any
 # Adjust import path if your project structure is different
 from node_graph import Port, PortType, Node, Graph
 
-# A minimal concrete Node for testing Port's node reference
+# A minimal Node without ports for testing Port's node reference
 class MockNodeForPort(Node):
-    def __init__(self, graph, name="MockNode"):
-        # Temporarily bypass the graph requirement for isolated node instance
-        self._graph = graph # Store graph reference manually if needed
-        self._name = name
-        self._id = "mock_node_for_port_test"
-        self.input_ports = {}
-        self.output_ports = {}
-        self.parameters = {}
-        # Don't call super().__init__ as it requires a graph in the simplified version
-        # No need to call _setup_ports/_setup_parameters for this mock
-
-    def _setup_ports(self): pass # Override abstract method
-    # def process(self): pass # No process in simplified Node base
+    pass
 
 # Need a graph instance for nodes, even if simple
 class MockGraphForPort:
@@ -26,11 +14,15 @@ class MockGraphForPort:
 
 class TestPort(unittest.TestCase):
 
+    @classmethod
+    def setUpClass(cls):
+        """Build the mock graph and nodes once; tests never modify them."""
+        cls.mock_graph = MockGraphForPort()
+        cls.node1 = MockNodeForPort(cls.mock_graph, "Node1")
+        cls.node2 = MockNodeForPort(cls.mock_graph, "Node2")
+
     def setUp(self):
-        """Set up test fixtures, if any."""
-        self.mock_graph = MockGraphForPort()
-        self.node1 = MockNodeForPort(self.mock_graph, "Node1")
-        self.node2 = MockNodeForPort(self.mock_graph, "Node2")
+        """Set up fresh ports per test, since tests attach connections to them."""
         # Create ports directly for testing, bypassing Node.add_port for isolation
         self.out_port = Port(self.node1, "out1", PortType.OUTPUT, data_type=int)
         self.in_port1 = Port(self.node2, "in1", PortType.INPUT, data_type=int)
@@ -69,17 +61,25 @@ class TestPort(unittest.TestCase):
         """Test connection attempt with incompatible data types."""
         self.assertFalse(self.out_port.can_connect(self.in_port2)) # int -> str
 
+    def test_can_connect_subclass_data_type(self):
+        """Test a subclass output may feed a base-class input, but not the reverse."""
+        out_bool = Port(self.node1, "out_bool", PortType.OUTPUT, data_type=bool)
+        out_int = Port(self.node2, "out_int", PortType.OUTPUT, data_type=int)
+        in_bool = Port(self.node1, "in_bool", PortType.INPUT, data_type=bool)
+        self.assertTrue(out_bool.can_connect(self.in_port1)) # bool -> int
+        self.assertFalse(out_int.can_connect(in_bool)) # int -> bool
+
     def test_can_connect_invalid_input_already_connected(self):
         """Test connection attempt to an already connected input port."""
         # Mock a connection
         mock_connection = object() # Just need a placeholder object
-        self.in_port1._connections.append(mock_connection) # Directly modify for test
+        self.in_port1.add_connection(mock_connection)
         self.assertTrue(self.in_port1.is_connected())
         self.assertFalse(self.out_port.can_connect(self.in_port1))
-        self.in_port1._connections.remove(mock_connection) # Clean up
+        self.in_port1.remove_connection(mock_connection) # Clean up
 
     def test_add_remove_connection(self):
-        """Test adding and removing a connection object to the port's list."""
+        """Test adding and removing a connection object to the port's set."""
         mock_connection = object() # Placeholder
         self.assertEqual(len(self.out_port.connections), 0)
         self.out_port.add_connection(mock_connection)
@@ -91,6 +91,16 @@ class TestPort(unittest.TestCase):
         self.assertEqual(len(self.out_port.connections), 0)
         self.assertFalse(self.out_port.is_connected())
 
+    def test_is_connected_until_last_connection_removed(self):
+        """Test an output stays connected while any of its connections remain."""
+        first, second = object(), object()
+        self.out_port.add_connection(first)
+        self.out_port.add_connection(second)
+        self.out_port.remove_connection(first)
+        self.assertTrue(self.out_port.is_connected())
+        self.out_port.remove_connection(second)
+        self.assertFalse(self.out_port.is_connected())
+
     def test_remove_nonexistent_connection(self):
         """Test removing a connection that isn't there doesn't raise error."""
         mock_connection = object()
@@ -99,6 +109,10 @@ class TestPort(unittest.TestCase):
         except ValueError:
             self.fail("Port.remove_connection() raised ValueError unexpectedly.")
 
+    def test_port_has_no_instance_dict(self):
+        """Test Port keeps its state in slots (no per-instance __dict__)."""
+        self.assertFalse(hasattr(self.out_port, "__dict__"))
+
     def test_port_repr(self):
         """Test the string representation of the port."""
         self.assertEqual(repr(self.out_port), "<Port Node1.out1 (OUTPUT, int)>")
@@ -1,9 +1,9 @@
 from PySide6.QtWidgets import QGraphicsPathItem
 from PySide6.QtGui import QPen, QPainterPath, QColor
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QPointF
 
 # Forward reference for type hinting
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 if TYPE_CHECKING:
     from .port_item import UIPort
     from node_graph import Connection # Backend connection
@@ -11,6 +11,13 @@ if TYPE_CHECKING:
 class UIConnection(QGraphicsPathItem):
     """Represents a visual connection (line/curve) between two UIPorts."""
 
+    # Attributes live in fixed slots, so no per-connection instance dict is allocated
+    __slots__ = ('_start_port_item', '_end_port_item', '_backend_connection', '_last_endpoints')
+
+    # Shared by every connection; QPen is implicitly shared, so items copy a
+    # reference rather than allocating their own pen
+    _DEFAULT_PEN = QPen(Qt.black, 2)
+
     def __init__(self, start_port_item: 'UIPort', end_port_item: 'UIPort', backend_connection: 'Connection'):
         super().__init__()
         self._start_port_item = start_port_item
@@ -21,9 +28,11 @@ class UIConnection(QGraphicsPathItem):
         self._start_port_item.add_connection_item(self)
         self._end_port_item.add_connection_item(self)
 
-        self.setPen(QPen(Qt.black, 2)) # Basic styling
+        self.setPen(UIConnection._DEFAULT_PEN) # Basic styling
         self.setZValue(-1) # Draw connections behind nodes/ports
 
+        # Endpoint coordinates the current path was built for
+        self._last_endpoints: Optional[tuple[float, float, float, float]] = None
         self.update_path() # Initial drawing
 
     @property
@@ -42,11 +51,17 @@ class UIConnection(QGraphicsPathItem):
         """Recalculates and sets the path based on port positions."""
         if not self._start_port_item or not self._end_port_item:
             # Handle cases where ports might have been deleted unexpectedly
+            self._last_endpoints = None
             self.setPath(QPainterPath()) # Clear path
             return
 
-        start_pos = self._start_port_item.mapToScene(0, 0) # Center of port item
-        end_pos = self._end_port_item.mapToScene(0, 0) # Center of port item
+        start_pos = self._start_port_item.get_scene_position() # Center of port item
+        end_pos = self._end_port_item.get_scene_position() # Center of port item
+
+        endpoints = (start_pos.x(), start_pos.y(), end_pos.x(), end_pos.y())
+        if endpoints == self._last_endpoints:
+            return # Neither end moved; the current path is still right
+        self._last_endpoints = endpoints
 
         path = QPainterPath()
         path.moveTo(start_pos)
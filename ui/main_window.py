@@ -17,6 +17,7 @@ class MainWindow(QMainWindow):
         self.scene = NodeGraphScene(self.backend_graph)
         self.view = QGraphicsView(self.scene)
         self.view.setRenderHint(QPainter.Antialiasing) # Smoother lines
+        self.scene.configure_view(self.view) # Update mode and paint optimizations
         self.view.setDragMode(QGraphicsView.RubberBandDrag) # Allow selecting multiple items
         self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
@@ -1,27 +1,31 @@
+import logging
+from contextlib import contextmanager
+from functools import partial
 from PySide6.QtWidgets import QGraphicsScene, QGraphicsSceneMouseEvent, QGraphicsView, QMenu, QGraphicsLineItem, QGraphicsItem
-from PySide6.QtGui import QPen, QColor, QTransform, QAction
-from PySide6.QtCore import Qt, QPointF
+from PySide6.QtGui import QBrush, QPen, QColor, QTransform, QAction
+from PySide6.QtCore import Qt, QPointF, QTimer
 from typing import Optional, Any
 from node_graph import Graph, Node # Backend graph and node base class
 from .node_item import UINode
-from .port_item import UIPort, PortType
+from .port_item import UIPort, TAG_UIPORT_IN, TAG_UIPORT_OUT
 from .connection_item import UIConnection
 
+log = logging.getLogger(__name__)
+
 # --- Concrete Node Types (Examples - replace with actual node classes later) ---
 # These should ideally be imported from a dedicated 'nodes' package when implemented
 class SimpleInputNode(Node):
-    def _setup_ports(self): self.add_output_port("out", int)
+    OUTPUT_PORTS = (("out", int),)
     def _setup_parameters(self): self.parameters['value'] = 0
     def process(self): pass # Simplified: No process logic needed for UI structure
 
 class SimpleProcessNode(Node):
-    def _setup_ports(self):
-        self.add_input_port("in1", int)
-        self.add_output_port("res", int)
+    INPUT_PORTS = (("in1", int),)
+    OUTPUT_PORTS = (("res", int),)
     def process(self): pass
 
 class SimpleOutputNode(Node):
-    def _setup_ports(self): self.add_input_port("in_val", int)
+    INPUT_PORTS = (("in_val", int),)
     def process(self): pass
 # --- End Example Node Types ---
 
@@ -30,6 +34,10 @@ NODE_TYPE_MAP = {
     "Process Node": SimpleProcessNode,
     "Output Node": SimpleOutputNode,
 }
+_NODE_NAMES = tuple(NODE_TYPE_MAP) # Fixed menu entries, in display order
+
+BG_BRUSH = QBrush(QColor(0x40, 0x40, 0x40)) # Dark background
+TEMP_LINE_PEN = QPen(QColor(255, 255, 0), 2) # yellow
 
 class NodeGraphScene(QGraphicsScene):
     """The scene containing nodes, connections, and handling interactions."""
@@ -37,43 +45,89 @@ class NodeGraphScene(QGraphicsScene):
     def __init__(self, backend_graph: Graph, parent=None):
         super().__init__(parent)
         self._backend_graph = backend_graph
-        self.setBackgroundBrush(QColor("#404040")) # Dark background
+        self.setBackgroundBrush(BG_BRUSH)
+        # Nodes move constantly while dragged, and the BSP index is rebuilt on
+        # every move; a linear scan is cheaper at editor scene sizes.
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
 
         # Mappings to keep backend and UI in sync
-        self._ui_nodes: dict[str, UINode] = {} # backend_node.id -> UINode
-        self._ui_connections: list[UIConnection] = [] # Keep track of UI connections
+        self._ui_nodes: dict[int, UINode] = {} # backend_node.id -> UINode
+        # Keep track of UI connections; id(item) -> item for O(1) removal
+        self._ui_connections: dict[int, UIConnection] = {}
+
+        # Connections whose paths need recomputing, flushed once per event-loop pass
+        self._dirty_connections: set[UIConnection] = set()
+        self._flush_scheduled = False
 
         # For connection dragging
         self._start_port_item: Optional[UIPort] = None
-        self._temp_connection_line: Optional[QGraphicsLineItem] = None
+        # Feedback line shown while dragging; created once and hidden between drags
+        self._temp_connection_line = QGraphicsLineItem()
+        self._temp_connection_line.setPen(TEMP_LINE_PEN) # Dashed line?
+        self._temp_connection_line.setZValue(0) # Draw above connections but below nodes
+        self._temp_connection_line.setVisible(False)
+        self.addItem(self._temp_connection_line)
+
+    def configure_view(self, view: QGraphicsView):
+        """
+        Applies the rendering settings this scene is tuned for to a view showing it.
+        Dragging a node or connection touches items across the viewport, so a
+        full repaint per frame is cheaper than Qt working out the dirty region.
+        """
+        view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+        # Items set their own pen/brush, and their bounding rects already
+        # include the pen width.
+        view.setOptimizationFlags(QGraphicsView.DontSavePainterState |
+                                  QGraphicsView.DontAdjustForAntialiasing)
+
+    @contextmanager
+    def bulk_update(self):
+        """
+        Context manager for adding or removing many items at once (e.g. when
+        loading a graph): scene signals are held back and any BSP index is
+        switched off until the block ends, then the scene repaints once.
+
+            with scene.bulk_update():
+                for node, pos in loaded:
+                    scene.add_node_to_scene(node, pos)
+        """
+        was_blocked = self.blockSignals(True)
+        index_method = self.itemIndexMethod()
+        self.setItemIndexMethod(QGraphicsScene.NoIndex)
+        try:
+            yield self
+        finally:
+            self.setItemIndexMethod(index_method)
+            self.blockSignals(was_blocked)
+            self.update()
 
     def add_node_to_scene(self, backend_node: Node, position: QPointF):
         """Creates and adds a UINode to the scene."""
         if backend_node.id in self._ui_nodes:
-            print(f"Warning: UI Node for backend node {backend_node.id} already exists.")
+            log.warning("UI Node for backend node %s already exists.", backend_node.id)
             return None
 
         ui_node = UINode(backend_node)
         self.addItem(ui_node)
         ui_node.setPos(position)
         self._ui_nodes[backend_node.id] = ui_node
-        print(f"Added UINode for '{backend_node.name}' ({backend_node.id}) at {position}")
+        log.debug("Added UINode for '%s' (%s) at %s", backend_node.name, backend_node.id, position)
         return ui_node
 
-    def remove_node_from_scene(self, backend_node_id: str):
+    def remove_node_from_scene(self, backend_node_id: int):
         """Removes a UINode and its related UIConnections from the scene."""
         ui_node = self._ui_nodes.pop(backend_node_id, None)
         if ui_node:
             # Remove connections visually *before* removing the node
             ports = list(ui_node._ui_ports.values()) # Get ports before node is gone
             for port in ports:
-                # Iterate over a copy as removing modifies the list
+                # Iterate over a copy as removing modifies the set
                 for conn_item in list(port._connection_items):
                      self.remove_connection_from_scene(conn_item)
 
             # Now remove the node item itself
             ui_node.destroy() # Calls removeItem internally
-            print(f"Removed UINode for {backend_node_id}")
+            log.debug("Removed UINode for %s", backend_node_id)
 
     def add_connection_to_scene(self, backend_connection):
         """Creates and adds a UIConnection to the scene."""
@@ -82,39 +136,48 @@ class NodeGraphScene(QGraphicsScene):
         start_port_name = backend_connection.output_port.name
         end_port_name = backend_connection.input_port.name
 
-        start_ui_node = self._ui_nodes.get(start_node_id)
-        end_ui_node = self._ui_nodes.get(end_node_id)
-
-        if not start_ui_node or not end_ui_node:
-            print("Error: Could not find UI nodes for connection.")
-            return None
-
-        start_ui_port = start_ui_node.get_ui_port(start_port_name)
-        end_ui_port = end_ui_node.get_ui_port(end_port_name)
-
-        if not start_ui_port or not end_ui_port:
-            print("Error: Could not find UI ports for connection.")
+        # Every lookup succeeds for connections made through the scene, so
+        # the rare miss is handled once instead of checking each step
+        try:
+            start_ui_port = self._ui_nodes[start_node_id]._ui_ports[start_port_name]
+            end_ui_port = self._ui_nodes[end_node_id]._ui_ports[end_port_name]
+        except KeyError as missing:
+            log.warning("Missing UI node/port %s for connection %s.", missing, backend_connection)
             return None
 
         # Check if visual connection already exists (shouldn't if backend added first)
-        # for existing_conn in self._ui_connections:
+        # for existing_conn in self._ui_connections.values():
         #     if (existing_conn.start_port_item == start_ui_port and
         #         existing_conn.end_port_item == end_ui_port):
-        #         print("Warning: UI Connection already exists.")
+        #         log.warning("UI Connection already exists.")
         #         return existing_conn
 
         ui_conn = UIConnection(start_ui_port, end_ui_port, backend_connection)
         self.addItem(ui_conn)
-        self._ui_connections.append(ui_conn)
-        print(f"Added UIConnection: {ui_conn}")
+        self._ui_connections[id(ui_conn)] = ui_conn
+        log.debug("Added UIConnection: %s", ui_conn)
         return ui_conn
 
     def remove_connection_from_scene(self, ui_connection_item: UIConnection):
-        """Removes a UIConnection item from the scene and internal list."""
-        if ui_connection_item in self._ui_connections:
+        """Removes a UIConnection item from the scene and internal mapping."""
+        self._dirty_connections.discard(ui_connection_item)
+        if self._ui_connections.pop(id(ui_connection_item), None) is not None:
             ui_connection_item.destroy() # Detaches from ports, removes from scene
-            self._ui_connections.remove(ui_connection_item)
-            print(f"Removed UIConnection: {ui_connection_item}")
+            log.debug("Removed UIConnection: %s", ui_connection_item)
+
+    def _mark_connections_dirty(self, connection_items):
+        """Queues connection items for a single deferred path update."""
+        self._dirty_connections.update(connection_items)
+        if self._dirty_connections and not self._flush_scheduled:
+            self._flush_scheduled = True
+            QTimer.singleShot(0, self._flush_connection_updates)
+
+    def _flush_connection_updates(self):
+        """Updates every queued connection once, however many moves queued it."""
+        self._flush_scheduled = False
+        dirty, self._dirty_connections = self._dirty_connections, set()
+        for conn_item in dirty:
+            conn_item.update_path()
 
     def get_item_at(self, position: QPointF) -> Optional[QGraphicsItem]:
         """Helper to get the topmost item at a scene position."""
@@ -127,24 +190,20 @@ class NodeGraphScene(QGraphicsScene):
         """Handle starting connections."""
         item = self.get_item_at(event.scenePos())
 
-        if isinstance(item, UIPort) and item.backend_port.port_type == PortType.OUTPUT:
+        if getattr(item, '_tag', 0) == TAG_UIPORT_OUT:
             self._start_port_item = item
-            # Create temporary line for visual feedback
-            self._temp_connection_line = QGraphicsLineItem()
-            self._temp_connection_line.setPen(QPen(QColor("yellow"), 2)) # Dashed line?
-            self._temp_connection_line.setZValue(0) # Draw above connections but below nodes
-            self.addItem(self._temp_connection_line)
+            # Show the temporary line for visual feedback
             start_pos = self._start_port_item.get_scene_position()
             self._temp_connection_line.setLine(start_pos.x(), start_pos.y(), event.scenePos().x(), event.scenePos().y())
-            print(f"Started connection drag from {self._start_port_item}")
+            self._temp_connection_line.setVisible(True)
+            log.debug("Started connection drag from %s", self._start_port_item)
         else:
             self._start_port_item = None
-            self._temp_connection_line = None
             super().mousePressEvent(event) # Allow node moving etc.
 
     def mouseMoveEvent(self, event: QGraphicsSceneMouseEvent):
         """Handle dragging connections."""
-        if self._start_port_item and self._temp_connection_line:
+        if self._start_port_item:
             start_pos = self._start_port_item.get_scene_position()
             self._temp_connection_line.setLine(start_pos.x(), start_pos.y(), event.scenePos().x(), event.scenePos().y())
         else:
@@ -152,17 +211,16 @@ class NodeGraphScene(QGraphicsScene):
 
     def mouseReleaseEvent(self, event: QGraphicsSceneMouseEvent):
         """Handle completing connections."""
-        if self._start_port_item and self._temp_connection_line:
-            print("Released connection drag")
-            # Remove temporary line
-            self.removeItem(self._temp_connection_line)
-            self._temp_connection_line = None
+        if self._start_port_item:
+            log.debug("Released connection drag")
+            # Hide temporary line until the next drag
+            self._temp_connection_line.setVisible(False)
 
             item = self.get_item_at(event.scenePos())
             target_port_item: Optional[UIPort] = None
-            if isinstance(item, UIPort) and item.backend_port.port_type == PortType.INPUT:
+            if getattr(item, '_tag', 0) == TAG_UIPORT_IN:
                  target_port_item = item
-                 print(f"Target port found: {target_port_item}")
+                 log.debug("Target port found: %s", target_port_item)
 
             if target_port_item:
                  # Attempt to add connection to backend graph
@@ -172,8 +230,9 @@ class NodeGraphScene(QGraphicsScene):
                  target_be_node = target_be_port.node
 
                  # Basic validation using backend (add cycle check if needed)
-                 if start_be_port.can_connect(target_be_port): # and not self._backend_graph.creates_cycle(start_be_node, target_be_node):
-                      print("Backend connection valid, attempting add...")
+                 if self._backend_graph.can_add_connection(start_be_node.id, start_be_port.name,
+                                                           target_be_node.id, target_be_port.name):
+                      log.debug("Backend connection valid, attempting add...")
                       backend_connection = self._backend_graph.add_connection(
                           start_be_node.id, start_be_port.name,
                           target_be_node.id, target_be_port.name
@@ -182,11 +241,11 @@ class NodeGraphScene(QGraphicsScene):
                            # Backend added successfully, add visual connection
                            self.add_connection_to_scene(backend_connection)
                       else:
-                           print("Backend refused connection.")
+                           log.debug("Backend refused connection.")
                  else:
-                      print("Backend ports cannot connect.")
+                      log.debug("Backend ports cannot connect.")
             else:
-                 print("Connection released over empty space or invalid target.")
+                 log.debug("Connection released over empty space or invalid target.")
 
             # Reset state
             self._start_port_item = None
@@ -200,19 +259,23 @@ class NodeGraphScene(QGraphicsScene):
         pos = event.scenePos()
 
         # Actions to add node types
-        for node_name in NODE_TYPE_MAP.keys():
+        for node_name in _NODE_NAMES:
             action = QAction(f"Add {node_name}", menu)
-            # Use lambda with default argument to capture correct node_name
-            action.triggered.connect(lambda checked=False, name=node_name: self.create_node_request(name, pos))
+            # triggered passes a 'checked' flag; the slot only wants name and position
+            action.triggered.connect(partial(self._on_add_node_action, node_name, pos))
             menu.addAction(action)
 
         menu.exec(event.screenPos())
 
+    def _on_add_node_action(self, node_type_name: str, position: QPointF, checked: bool = False):
+        """Context-menu slot; drops the 'checked' argument of QAction.triggered."""
+        self.create_node_request(node_type_name, position)
+
     def create_node_request(self, node_type_name: str, position: QPointF):
         """Handles request to create a new node."""
         node_class = NODE_TYPE_MAP.get(node_type_name)
         if node_class:
-            print(f"Requesting creation of {node_type_name} at {position}")
+            log.debug("Requesting creation of %s at %s", node_type_name, position)
             # Create backend node instance FIRST
             new_backend_node = node_class(self._backend_graph, node_type_name) # Pass graph
             # Add backend node to the actual graph
@@ -220,4 +283,4 @@ class NodeGraphScene(QGraphicsScene):
             # Add corresponding UI node to the scene
             self.add_node_to_scene(new_backend_node, position)
         else:
-            print(f"Error: Unknown node type requested: {node_type_name}")
\ No newline at end of file
+            log.warning("Unknown node type requested: %s", node_type_name)
\ No newline at end of file
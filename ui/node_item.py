@@ -1,8 +1,9 @@
+import functools
 from PySide6.QtWidgets import (QGraphicsRectItem, QGraphicsItem, QGraphicsTextItem,
                                QStyleOptionGraphicsItem, QWidget)
 from PySide6.QtGui import QBrush, QPen, QPainter, QColor, QFont
 from PySide6.QtCore import Qt, QRectF, QPointF
-from typing import Optional, Any
+from typing import Optional
 from node_graph import Node, PortType # Backend node
 from .port_item import UIPort, PORT_DIAMETER, PORT_RADIUS # Visual port
 
@@ -10,9 +11,22 @@ NODE_WIDTH = 150
 NODE_HEIGHT = 80 # Base height, might need adjusting based on ports
 HEADER_HEIGHT = 20
 
+# Shared styling; Qt copies these by reference into each item
+NODE_BRUSH = QBrush(QColor(0x55, 0x55, 0x55)) # Dark gray background
+NODE_PEN = QPen(Qt.black)
+HEADER_COLOR = QColor(0x33, 0x33, 0x33) # Slightly darker header
+TITLE_FONT = QFont("Arial", 10, QFont.Bold)
+
+@functools.lru_cache(maxsize=64)
+def _port_ys(count: int) -> tuple[float, ...]:
+    """Y centers of a column of `count` ports below the header (shared per count)."""
+    return tuple(HEADER_HEIGHT + 5 + i * (PORT_DIAMETER + 5) + PORT_RADIUS for i in range(count))
+
 class UINode(QGraphicsRectItem):
     """Represents a visual node in the scene."""
 
+    _HEADER_RECT = QRectF(0, 0, NODE_WIDTH, HEADER_HEIGHT) # Same for every node, reused by paint()
+
     def __init__(self, backend_node: Node):
         # Calculate initial height based on port count
         max_ports = max(len(backend_node.input_ports), len(backend_node.output_ports))
@@ -23,16 +37,17 @@ class UINode(QGraphicsRectItem):
         self._ui_ports: dict[str, UIPort] = {} # Map backend port name to UIPort item
 
         # Styling
-        self.setBrush(QBrush(QColor("#555555"))) # Dark gray background
-        self.setPen(QPen(Qt.black))
+        self.setBrush(NODE_BRUSH)
+        self.setPen(NODE_PEN)
+        # No ItemSendsGeometryChanges: nothing reacts to the node's own position
+        # notifications; its ports are told about moves (see UIPort.itemChange)
         self.setFlags(QGraphicsItem.ItemIsMovable |
-                      QGraphicsItem.ItemIsSelectable |
-                      QGraphicsItem.ItemSendsGeometryChanges) # Important for connections
+                      QGraphicsItem.ItemIsSelectable)
 
         # Node Title
         self.title = QGraphicsTextItem(backend_node.name, self)
         self.title.setDefaultTextColor(Qt.white)
-        self.title.setFont(QFont("Arial", 10, QFont.Bold))
+        self.title.setFont(TITLE_FONT)
         title_x = (NODE_WIDTH - self.title.boundingRect().width()) / 2
         self.title.setPos(title_x, 0)
 
@@ -44,36 +59,27 @@ class UINode(QGraphicsRectItem):
 
     def _create_ports(self):
         """Create UIPort items based on the backend node's ports."""
-        input_y = HEADER_HEIGHT + 5
-        output_y = HEADER_HEIGHT + 5
+        input_ports = self._backend_node.input_ports
+        output_ports = self._backend_node.output_ports
 
-        for port_name, backend_port in self._backend_node.input_ports.items():
+        # Left edge, centered vertically
+        for (port_name, backend_port), y in zip(input_ports.items(), _port_ys(len(input_ports))):
             port_item = UIPort(self, backend_port)
-            port_item.setPos(0, input_y + PORT_RADIUS) # Left edge, centered vertically
+            port_item.setPos(0, y)
             self._ui_ports[port_name] = port_item
-            input_y += PORT_DIAMETER + 5 # Spacing
 
-        for port_name, backend_port in self._backend_node.output_ports.items():
+        # Right edge, centered vertically
+        for (port_name, backend_port), y in zip(output_ports.items(), _port_ys(len(output_ports))):
             port_item = UIPort(self, backend_port)
-            port_item.setPos(NODE_WIDTH, output_y + PORT_RADIUS) # Right edge, centered vertically
+            port_item.setPos(NODE_WIDTH, y)
             self._ui_ports[port_name] = port_item
-            output_y += PORT_DIAMETER + 5 # Spacing
 
     def get_ui_port(self, port_name: str) -> Optional[UIPort]:
         return self._ui_ports.get(port_name)
 
-    # Override itemChange to update connections when node moves
-    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value: Any) -> Any:
-        if change == QGraphicsItem.ItemPositionHasChanged:
-            # Update all connections attached to this node's ports
-            for port_item in self._ui_ports.values():
-                port_item.update_connection_positions()
-        return super().itemChange(change, value)
-
     def paint(self, painter: QPainter, option: QStyleOptionGraphicsItem, widget: Optional[QWidget] = None):
         # Draw header background
-        header_rect = QRectF(0, 0, NODE_WIDTH, HEADER_HEIGHT)
-        painter.fillRect(header_rect, QColor("#333333")) # Slightly darker header
+        painter.fillRect(UINode._HEADER_RECT, HEADER_COLOR)
 
         # Let the base class draw the main rectangle outline etc.
         super().paint(painter, option, widget)
@@ -1,6 +1,7 @@
 from PySide6.QtWidgets import QGraphicsEllipseItem, QGraphicsItem, QGraphicsSceneMouseEvent
 from PySide6.QtGui import QBrush, QPen, QColor, QPainterPath
 from PySide6.QtCore import Qt, QRectF, QPointF
+from typing import Optional
 
 # Assuming node_graph package is importable
 from node_graph import Port, PortType
@@ -8,22 +9,42 @@ from node_graph import Port, PortType
 PORT_RADIUS = 5
 PORT_DIAMETER = PORT_RADIUS * 2
 
+# Item type tags, so event handlers can classify items with one attribute load
+TAG_UIPORT_IN = 1
+TAG_UIPORT_OUT = 2
+
+# Shared styling; Qt copies these by reference into each item
+INPUT_BRUSH = QBrush(QColor(173, 216, 230)) # lightblue
+OUTPUT_BRUSH = QBrush(QColor(144, 238, 144)) # lightgreen
+PORT_PEN = QPen(Qt.black)
+
 class UIPort(QGraphicsEllipseItem):
     """Represents a visual port (input/output point) on a UINode."""
 
+    # Shiboken objects keep a __dict__ regardless, but attributes declared here
+    # live in fixed slots, so a port's instance dict is never allocated
+    __slots__ = ('_parent_node_item', '_backend_port', '_connection_items', '_tag',
+                 '_cached_scene_pos', '_repr')
+
     def __init__(self, parent_node_item: 'UINode', backend_port: Port):
         super().__init__(-PORT_RADIUS, -PORT_RADIUS, PORT_DIAMETER, PORT_DIAMETER, parent=parent_node_item)
         self._parent_node_item = parent_node_item
         self._backend_port = backend_port
-        self._connection_items: list['UIConnection'] = [] # Connections attached to this UI port
+        self._connection_items: set['UIConnection'] = set() # Connections attached to this UI port
+        self._tag = TAG_UIPORT_OUT if backend_port.port_type == PortType.OUTPUT else TAG_UIPORT_IN
+        # Last scene position reported by itemChange (scenePos() walks the parent chain)
+        self._cached_scene_pos: Optional[QPointF] = None
 
         # Basic styling
-        self.setBrush(QBrush(QColor("lightblue") if backend_port.port_type == PortType.INPUT else QColor("lightgreen")))
-        self.setPen(QPen(Qt.black))
+        self.setBrush(INPUT_BRUSH if backend_port.port_type == PortType.INPUT else OUTPUT_BRUSH)
+        self.setPen(PORT_PEN)
         self.setAcceptHoverEvents(True) # Needed for hover feedback if desired
+        # Qt reports the new scene position whenever this port or its node moves
+        self.setFlag(QGraphicsItem.ItemSendsScenePositionChanges)
 
         # Tooltip shows port name and type
         self.setToolTip(f"{backend_port.name} ({backend_port.data_type.__name__})")
+        self.refresh_repr() # Sets self._repr, so logging a port doesn't walk to its node
 
     @property
     def backend_port(self) -> Port:
@@ -34,28 +55,48 @@ class UIPort(QGraphicsEllipseItem):
         return self._parent_node_item
 
     def get_scene_position(self) -> QPointF:
-        """Get the port's position in scene coordinates."""
-        return self.scenePos()
+        """Get the port's position in scene coordinates (cached; don't modify the result)."""
+        pos = self._cached_scene_pos
+        if pos is None:
+            pos = self._cached_scene_pos = self.scenePos()
+        return pos
+
+    def itemChange(self, change: QGraphicsItem.GraphicsItemChange, value):
+        if change == QGraphicsItem.ItemScenePositionHasChanged:
+            # value is the new scene position, already computed by Qt
+            self._cached_scene_pos = value
+            if self._connection_items:
+                self.update_connection_positions()
+        return super().itemChange(change, value)
 
     def add_connection_item(self, connection_item: 'UIConnection'):
-        if connection_item not in self._connection_items:
-            self._connection_items.append(connection_item)
+        self._connection_items.add(connection_item)
 
     def remove_connection_item(self, connection_item: 'UIConnection'):
-        try:
-            self._connection_items.remove(connection_item)
-        except ValueError:
-            pass # Ignore if not found
+        self._connection_items.discard(connection_item) # No-op if not attached
 
     def update_connection_positions(self):
-        """Tell connected lines to update their paths."""
-        for conn_item in self._connection_items:
-            conn_item.update_path()
+        """
+        Tell connected lines to update their paths. In a NodeGraphScene the
+        update is deferred and coalesced with other moves in the same
+        event-loop pass; elsewhere (e.g. a plain QGraphicsScene) it is immediate.
+        """
+        # Looked up by name: port_item can't import node_graph_scene (cycle)
+        mark_dirty = getattr(self.scene(), '_mark_connections_dirty', None)
+        if mark_dirty is not None:
+            mark_dirty(self._connection_items)
+        else:
+            for conn_item in self._connection_items:
+                conn_item.update_path()
 
     # --- Mouse Events for Connection Dragging (handled by scene for now) ---
     # Override mousePressEvent, mouseMoveEvent, mouseReleaseEvent if needed
     # directly on the port, but starting drag logic is often cleaner in the scene.
 
-    def __repr__(self):
+    def refresh_repr(self):
+        """Rebuilds the cached repr; call after the backend node is renamed."""
         node_name = self.parent_node_item.backend_node.name if self.parent_node_item else "Detached"
-        return f"<UIPort name='{self.backend_port.name}' node='{node_name}'>"
\ No newline at end of file
+        self._repr = f"<UIPort name='{self.backend_port.name}' node='{node_name}'>"
+
+    def __repr__(self):
+        return self._repr
\ No newline at end of file